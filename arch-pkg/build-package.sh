@@ -6,12 +6,26 @@ set -e
 
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 PROJECT_DIR="$(dirname "$SCRIPT_DIR")"
+RELEASE_DIR="$PROJECT_DIR/build/linux/x64/release"
 
 echo "╔══════════════════════════════════════════════════════════════╗"
 echo "║       Notebook Converter - Arch Linux Package Builder        ║"
 echo "╚══════════════════════════════════════════════════════════════╝"
 echo ""
 
+# Check packaging tools up front so a missing one fails before the Flutter build
+MISSING_TOOLS=()
+for tool in makepkg tar; do
+    command -v "$tool" &> /dev/null || MISSING_TOOLS+=("$tool")
+done
+if [ ${#MISSING_TOOLS[@]} -gt 0 ]; then
+    echo "✗ Missing required tools: ${MISSING_TOOLS[*]}"
+    exit 1
+fi
+
+# Location found by a previous run, reused while it still holds a flutter binary
+FLUTTER_CACHE_FILE="${XDG_CACHE_HOME:-$HOME/.cache}/notebook-converter/flutter-bin"
+
 # Function to find Flutter
 find_flutter() {
     # Check if already in PATH
@@ -19,7 +33,17 @@ find_flutter() {
         echo "$(dirname "$(command -v flutter)")"
         return 0
     fi
-    
+
+    # Check the location remembered from the last run
+    if [ -f "$FLUTTER_CACHE_FILE" ]; then
+        local cached
+        cached="$(cat "$FLUTTER_CACHE_FILE")"
+        if [ -x "$cached/flutter" ]; then
+            echo "$cached"
+            return 0
+        fi
+    fi
+
     # Common Flutter installation locations
     local flutter_locations=(
         "$HOME/Develop/flutter/bin"
@@ -34,6 +58,7 @@ find_flutter() {
     
     for loc in "${flutter_locations[@]}"; do
         if [ -x "$loc/flutter" ]; then
+            mkdir -p "$(dirname "$FLUTTER_CACHE_FILE")" && echo "$loc" > "$FLUTTER_CACHE_FILE"
             echo "$loc"
             return 0
         fi
@@ -52,7 +77,7 @@ else
     echo ""
     
     # Check if pre-built binary exists
-    if [ -d "$PROJECT_DIR/build/linux/x64/release/bundle" ]; then
+    if [ -d "$RELEASE_DIR/bundle" ]; then
         echo "✓ Pre-built binary found! Using existing build."
         SKIP_BUILD=1
     else
@@ -65,12 +90,14 @@ else
         echo ""
         read -p "Enter Flutter path (or press Enter to abort): " CUSTOM_PATH
         
+        if [ -n "$CUSTOM_PATH" ] && [ -x "$CUSTOM_PATH/bin/flutter" ]; then
+            CUSTOM_PATH="$CUSTOM_PATH/bin"
+        fi
+
         if [ -n "$CUSTOM_PATH" ] && [ -x "$CUSTOM_PATH/flutter" ]; then
             export PATH="$CUSTOM_PATH:$PATH"
+            mkdir -p "$(dirname "$FLUTTER_CACHE_FILE")" && echo "$CUSTOM_PATH" > "$FLUTTER_CACHE_FILE"
             echo "✓ Using Flutter at: $CUSTOM_PATH"
-        elif [ -n "$CUSTOM_PATH" ] && [ -x "$CUSTOM_PATH/bin/flutter" ]; then
-            export PATH="$CUSTOM_PATH/bin:$PATH"
-            echo "✓ Using Flutter at: $CUSTOM_PATH/bin"
         else
             echo "✗ Flutter not found. Aborting."
             exit 1
@@ -80,12 +107,32 @@ fi
 
 cd "$PROJECT_DIR"
 
-# Build Flutter app
+# Hash of everything that feeds the Linux build: the sources (minus the
+# generated linux/flutter/ephemeral, which the build itself rewrites) and
+# the Flutter SDK version
+source_hash() {
+    {
+        find lib linux assets pubspec.yaml pubspec.lock \
+            -path linux/flutter/ephemeral -prune -o -type f -print0 2>/dev/null \
+            | sort -z | xargs -0 sha256sum
+        flutter --version --machine 2>/dev/null
+    } | sha256sum | cut -d' ' -f1
+}
+
+# Build Flutter app (skipped when the sources match the existing bundle;
+# delete build/linux/x64/release/.source-hash to force a rebuild)
 if [ -z "$SKIP_BUILD" ]; then
+    BUILD_STAMP="$RELEASE_DIR/.source-hash"
+    SOURCE_HASH="$(source_hash)"
     echo ""
-    echo "→ Building Flutter app (release mode)..."
-    flutter build linux --release
-    echo "✓ Build complete!"
+    if [ -d "$RELEASE_DIR/bundle" ] && [ -f "$BUILD_STAMP" ] && [ "$(cat "$BUILD_STAMP")" = "$SOURCE_HASH" ]; then
+        echo "✓ Build is up to date, reusing existing bundle"
+    else
+        echo "→ Building Flutter app (release mode)..."
+        flutter build linux --release
+        echo "$SOURCE_HASH" > "$BUILD_STAMP"
+        echo "✓ Build complete!"
+    fi
 fi
 
 echo ""
@@ -97,18 +144,13 @@ cd "$SCRIPT_DIR"
 rm -rf pkg src *.tar.gz 2>/dev/null || true
 
 # Create the bundle tarball
-if [ -d "$PROJECT_DIR/build/linux/x64/release/bundle" ]; then
+if [ -d "$RELEASE_DIR/bundle" ]; then
     echo "→ Creating bundle archive..."
-    cd "$PROJECT_DIR/build/linux/x64/release"
-    tar -czf "$SCRIPT_DIR/bundle.tar.gz" bundle
-    cd "$SCRIPT_DIR"
+    tar -czf "$SCRIPT_DIR/bundle.tar.gz" -C "$RELEASE_DIR" bundle
 fi
 
-# Use the prebuilt PKGBUILD for simpler packaging
+# Write a PKGBUILD that installs the local bundle
 echo "→ Running makepkg..."
-cp PKGBUILD-prebuilt PKGBUILD.tmp
-
-# Update the source to use local bundle
 cat > PKGBUILD << 'PKGBUILD_CONTENT'
 # Maintainer: Your Name <your-email@example.com>
 pkgname=notebook-converter
@@ -158,7 +200,6 @@ EOF
     # Install icons for KDE/GNOME (all standard sizes)
     install -Dm644 "icon.svg" "$pkgdir/usr/share/icons/hicolor/scalable/apps/$pkgname.svg"
     for size in 16 22 24 32 48 64 128 256 512; do
-        install -dm755 "$pkgdir/usr/share/icons/hicolor/${size}x${size}/apps"
         install -Dm644 "icon-${size}.png" "$pkgdir/usr/share/icons/hicolor/${size}x${size}/apps/$pkgname.png" 2>/dev/null || true
     done
 }
@@ -166,8 +207,6 @@ PKGBUILD_CONTENT
 
 makepkg -sf --noconfirm
 
-rm -f PKGBUILD.tmp
-
 echo ""
 echo "╔══════════════════════════════════════════════════════════════╗"
 echo "║                  ✓ Package built successfully!               ║"
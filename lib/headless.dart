@@ -0,0 +1,101 @@
+import 'dart:io';
+import 'services/conversion_state.dart';
+
+/// Command-line usage, printed for `--help` or invalid arguments
+const String headlessUsage = '''
+Usage: notebook-converter --headless [options] <file.ipynb | folder>...
+
+Converts notebooks without opening the window, using the same parallel
+batch conversion as the app.
+
+Options:
+  -o, --output <dir>    Write HTML here instead of next to each notebook
+  -t, --theme <name>    Built-in theme (default: tokyoNight)
+  -j, --jobs <n>        Number of notebooks converted in parallel
+                        (default: one per core)
+      --no-images       Don't embed output images
+      --no-input        Hide code cell inputs
+      --no-theme-name   Don't append the theme name to output file names
+  -h, --help            Show this help
+''';
+
+/// Run a conversion batch from command-line [args] and return the exit code:
+/// 0 when every notebook converted, 1 when any failed, 2 for usage errors
+Future<int> runHeadless(List<String> args) async {
+  final state = ConversionState();
+  final paths = <String>[];
+  int? jobs;
+
+  try {
+    final remaining = args.iterator;
+    while (remaining.moveNext()) {
+      final arg = remaining.current;
+      String value() {
+        if (!remaining.moveNext()) throw FormatException('Missing value for $arg');
+        return remaining.current;
+      }
+
+      switch (arg) {
+        case '--headless':
+          break;
+        case '-h' || '--help':
+          stdout.write(headlessUsage);
+          return 0;
+        case '-o' || '--output':
+          state.setOutputDirectory(value());
+        case '-t' || '--theme':
+          final name = value();
+          state.setTheme(
+            HtmlTheme.values.firstWhere(
+              (t) => t.name == name,
+              orElse: () => throw FormatException(
+                'Unknown theme "$name" (available: ${HtmlTheme.values.map((t) => t.name).join(', ')})',
+              ),
+            ),
+          );
+        case '-j' || '--jobs':
+          jobs = int.tryParse(value());
+          if (jobs == null || jobs < 1) {
+            throw const FormatException('--jobs needs a positive number');
+          }
+        case '--no-images':
+          state.setEmbedImages(false);
+        case '--no-input':
+          state.setIncludeInput(false);
+        case '--no-theme-name':
+          state.setAppendThemeName(false);
+        default:
+          if (arg.startsWith('-')) throw FormatException('Unknown option $arg');
+          paths.add(arg);
+      }
+    }
+  } on FormatException catch (e) {
+    stderr.writeln(e.message);
+    stderr.write(headlessUsage);
+    return 2;
+  }
+
+  await state.addFiles(paths);
+  if (!state.hasFiles) {
+    stderr.writeln('No notebooks found');
+    return 2;
+  }
+
+  final total = state.files.length;
+  stdout.writeln('Converting $total notebook(s)...');
+  // No UI to keep responsive, so every core converts by default
+  await state.convertAll(maxWorkers: jobs ?? Platform.numberOfProcessors);
+
+  for (final file in state.files) {
+    if (file.status == ConversionStatus.completed) {
+      stdout.writeln('✓ ${file.name} → ${file.outputPath}');
+    } else {
+      stdout.writeln('✗ ${file.name}: ${file.error ?? 'not converted'}');
+    }
+  }
+  final converted = state.completedCount;
+  stdout.writeln('$converted/$total converted');
+
+  state.dispose();
+  return converted == total ? 0 : 1;
+}
@@ -1,13 +1,23 @@
+import 'dart:io';
 import 'package:flutter/material.dart';
 import 'package:google_fonts/google_fonts.dart';
 import 'package:provider/provider.dart';
+import 'headless.dart';
 import 'screens/home_screen.dart';
 import 'services/conversion_state.dart';
 
 // Export for provider access
 export 'services/conversion_state.dart';
 
-void main() async {
+void main(List<String> args) async {
+  // Scripted batch runs skip the UI entirely
+  if (args.contains('--headless')) {
+    final code = await runHeadless(args);
+    // exit() doesn't wait for buffered output, so flush the results first
+    await Future.wait([stdout.flush(), stderr.flush()]);
+    exit(code);
+  }
+
   WidgetsFlutterBinding.ensureInitialized();
   
   // Load custom themes
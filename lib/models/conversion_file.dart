@@ -0,0 +1,18 @@
+/// Represents a file to be converted
+class ConversionFile {
+  final String path;
+  final String name;
+  ConversionStatus status;
+  String? error;
+  String? outputPath;
+
+  ConversionFile({
+    required this.path,
+    required this.name,
+    this.status = ConversionStatus.pending,
+    this.error,
+    this.outputPath,
+  });
+}
+
+enum ConversionStatus { pending, converting, completed, failed }
@@ -242,15 +242,16 @@ class CellOutput {
   }
 
   /// Get image data (base64) if available
-  /// Returns map with mime type as key
-  Map<String, String> getImageData() {
-    final images = <String, String>{};
+  /// Returns map with mime type as key and the data as stored in the
+  /// notebook (one or more parts), so large images aren't joined into a copy
+  Map<String, List<String>> getImageData() {
+    final images = <String, List<String>>{};
     if (data == null) return images;
 
     for (final mimeType in ['image/png', 'image/jpeg', 'image/svg+xml', 'image/gif']) {
       if (data!.containsKey(mimeType)) {
         final val = data![mimeType];
-        images[mimeType] = val is List ? val.join() : val.toString();
+        images[mimeType] = val is List ? [for (final part in val) part.toString()] : [val.toString()];
       }
     }
     return images;
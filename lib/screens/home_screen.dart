@@ -1,4 +1,5 @@
 import 'dart:io';
+import 'dart:math';
 import 'package:flutter/material.dart';
 import 'package:flutter_animate/flutter_animate.dart';
 import 'package:provider/provider.dart';
@@ -10,6 +11,9 @@ import '../widgets/file_list_tile.dart';
 import '../widgets/settings_panel.dart';
 import '../widgets/drop_zone.dart';
 
+/// Resolved once; the platform can't change while the app runs
+final bool _isDesktop = Platform.isLinux || Platform.isWindows || Platform.isMacOS;
+
 class HomeScreen extends StatefulWidget {
   const HomeScreen({super.key});
 
@@ -18,13 +22,17 @@ class HomeScreen extends StatefulWidget {
 }
 
 class _HomeScreenState extends State<HomeScreen> {
+  /// Rows whose entry animation is staggered by list position
+  static const int _maxStaggeredRows = 10;
+
   bool _isDragging = false;
 
   @override
   Widget build(BuildContext context) {
     final state = context.watch<ConversionState>();
     final colorScheme = Theme.of(context).colorScheme;
-    final isDesktop = Platform.isLinux || Platform.isWindows || Platform.isMacOS;
+    // sizeOf only rebuilds on size changes, not on every MediaQuery update
+    final showSidebar = _isDesktop && MediaQuery.sizeOf(context).width > 800;
 
     return Scaffold(
       body: DropTarget(
@@ -52,7 +60,7 @@ class _HomeScreenState extends State<HomeScreen> {
                     ),
                     
                     // Settings sidebar (desktop only)
-                    if (isDesktop && MediaQuery.of(context).size.width > 800)
+                    if (showSidebar)
                       Container(
                         width: 320,
                         decoration: BoxDecoration(
@@ -76,7 +84,7 @@ class _HomeScreenState extends State<HomeScreen> {
       ),
       
       // FAB for mobile settings
-      floatingActionButton: (!isDesktop || MediaQuery.of(context).size.width <= 800)
+      floatingActionButton: !showSidebar
           ? FloatingActionButton(
               onPressed: () => _showSettingsSheet(context),
               child: const Icon(Icons.settings),
@@ -217,7 +225,9 @@ class _HomeScreenState extends State<HomeScreen> {
                     : null,
               ).animate().fadeIn(
                 duration: 200.ms,
-                delay: (50 * index).ms,
+                // Stagger only the first rows; in long lists the delay (and
+                // the pending animation timers) would otherwise grow per row
+                delay: (50 * min(index, _maxStaggeredRows)).ms,
               ).slideX(begin: 0.05);
             },
           ),
@@ -337,11 +347,10 @@ class _HomeScreenState extends State<HomeScreen> {
     );
   }
 
-  Future<void> _openFile(String path) async {
-    final uri = Uri.file(path);
-    if (await canLaunchUrl(uri)) {
-      await launchUrl(uri);
-    }
+  void _openFile(String path) {
+    // Hand off to the system opener without waiting on it; launchUrl reports
+    // an unlaunchable file itself, so no separate canLaunchUrl round trip
+    launchUrl(Uri.file(path)).catchError((_) => false);
   }
 }
 
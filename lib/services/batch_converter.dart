@@ -0,0 +1,350 @@
+import 'dart:async';
+import 'dart:convert';
+import 'dart:io';
+import 'dart:isolate';
+import 'dart:math';
+import 'package:flutter/foundation.dart';
+import 'package:path/path.dart' as p;
+import '../models/conversion_file.dart';
+import 'html_file_sink.dart';
+import 'notebook_converter.dart';
+
+/// Converts batches of notebooks in parallel on background isolates,
+/// updating each [ConversionFile]'s status as it goes. Shared by the app
+/// and headless mode so both run the same conversion path.
+class BatchConverter {
+  /// Number of files converted concurrently in a batch: one per core, less
+  /// one left free for the UI isolate's event loop and rendering
+  static final int defaultWorkers = max(1, Platform.numberOfProcessors - 1);
+
+  // Last successful conversion per output path, used to skip files that
+  // haven't changed since they were converted with the same settings
+  final Map<String, _ConversionRecord> _conversionCache = {};
+  // Entry point of the conversion worker isolates
+  final void Function((SendPort, ConversionSettings)) _workerMain;
+
+  BatchConverter() : _workerMain = _conversionWorkerMain;
+
+  /// Converter whose workers run [workerMain] in place of the real
+  /// conversion loop, so tests can make a worker fail
+  @visibleForTesting
+  BatchConverter.withWorkerMain(void Function((SendPort, ConversionSettings)) workerMain)
+      : _workerMain = workerMain;
+
+  /// Convert [files] with [settings], writing `<name><outputSuffix>` into
+  /// [outputDirectory] (or next to each notebook). [onProgress] is called
+  /// once as the batch starts and once per finished file
+  Future<void> convert(
+    List<ConversionFile> files, {
+    required ConversionSettings settings,
+    required String? outputDirectory,
+    required String outputSuffix,
+    int? maxWorkers,
+    required void Function() onProgress,
+  }) async {
+    final batch = _ConversionBatch(
+      settingsKey: _settingsKey(settings),
+      outputDirectory: outputDirectory,
+      outputSuffix: outputSuffix,
+    );
+
+    // Workers pull from a shared queue and each hands its files to its own
+    // long-lived background isolate, so notebooks convert in parallel without
+    // blocking the UI and per-isolate setup happens once per batch.
+    final queue = files.iterator;
+    Future<void> worker(_ConversionWorker isolate) async {
+      // A worker whose isolate died stops taking files; the rest of the
+      // queue goes to the workers still running
+      while (isolate.isAlive && queue.moveNext()) {
+        await _convertFile(queue.current, batch, isolate, onProgress);
+      }
+    }
+
+    final workers = <_ConversionWorker>[];
+    try {
+      workers.addAll(
+        await Future.wait(
+          // No more isolates than there are files to convert
+          List.generate(
+            min(maxWorkers ?? defaultWorkers, files.length),
+            (_) => _ConversionWorker.spawn(_workerMain, settings),
+          ),
+          cleanUp: (_ConversionWorker isolate) => isolate.close(),
+        ),
+      );
+      // Every worker marks its first file converting before yielding, so one
+      // report shows the whole first wave
+      final running = Future.wait(workers.map(worker));
+      onProgress();
+      await running;
+    } catch (e) {
+      debugPrint('Error starting conversion workers: $e');
+    } finally {
+      for (final isolate in workers) {
+        isolate.close();
+      }
+    }
+  }
+
+  Future<void> _convertFile(
+    ConversionFile file,
+    _ConversionBatch batch,
+    _ConversionWorker isolate,
+    void Function() onProgress,
+  ) async {
+    // Completed files go through again too, since the settings may have
+    // changed; the conversion cache below skips the ones that haven't.
+    // No progress report here: the update for the previous file (or the batch
+    // start) is delivered after this runs, so it shows this status too
+    file.status = ConversionStatus.converting;
+    file.error = null;
+
+    try {
+      // Determine output path
+      final outputDir = batch.outputDirectory ?? p.dirname(file.path);
+      // file.name is already the base name, so only the extension is
+      // stripped rather than parsing the full path again
+      final baseName = p.basenameWithoutExtension(file.name);
+      var outputPath = p.join(outputDir, '$baseName${batch.outputSuffix}');
+      // Files convert in parallel, so two notebooks with the same name (from
+      // different folders, into one output directory) must not write the
+      // same file. Claimed before the first await, so later files in queue
+      // order get the numbered names
+      for (var n = 2; !batch.outputPaths.add(p.canonicalize(outputPath)); n++) {
+        outputPath = p.join(outputDir, '$baseName ($n)${batch.outputSuffix}');
+      }
+
+      // Ensure output directory exists
+      await batch.outputDirs.putIfAbsent(
+        outputDir,
+        () => Directory(outputDir).create(recursive: true),
+      );
+
+      // Skip notebooks whose output is still the one written for this exact
+      // input and settings. The input path is compared too: another notebook
+      // with the same name can map to the same output with an equal mtime
+      final inputModified = (await File(file.path).stat()).modified;
+      final cached = _conversionCache[outputPath];
+      if (cached != null &&
+          cached.inputPath == file.path &&
+          cached.settingsKey == batch.settingsKey &&
+          cached.inputModified == inputModified &&
+          (await File(outputPath).stat()).modified == cached.outputModified) {
+        file.status = ConversionStatus.completed;
+        file.outputPath = outputPath;
+        onProgress();
+        return;
+      }
+
+      // Read, parse, convert and write on a background isolate
+      await isolate.convert(
+        _ConversionTask(
+          inputPath: file.path,
+          outputPath: outputPath,
+          title: baseName,
+        ),
+      );
+
+      _conversionCache[outputPath] = _ConversionRecord(
+        inputPath: file.path,
+        settingsKey: batch.settingsKey,
+        inputModified: inputModified,
+        outputModified: (await File(outputPath).stat()).modified,
+      );
+
+      file.status = ConversionStatus.completed;
+      file.outputPath = outputPath;
+    } catch (e) {
+      file.status = ConversionStatus.failed;
+      file.error = e.toString();
+      debugPrint('Conversion error for ${file.name}: $e');
+    }
+
+    onProgress();
+  }
+}
+
+/// Identifies everything in [settings] that affects the generated HTML
+String _settingsKey(ConversionSettings settings) {
+  return jsonEncode([
+    settings.embedImages,
+    settings.includeInput,
+    settings.theme.name,
+    settings.customTheme?.toJson(),
+    settings.customCss,
+  ]);
+}
+
+/// Settings snapshot shared by every file of one [BatchConverter.convert]
+class _ConversionBatch {
+  final String settingsKey;
+  final String? outputDirectory;
+  final String outputSuffix;
+  // Each output directory is created once per batch, not once per file
+  final Map<String, Future<Directory>> outputDirs = {};
+  // Output files already claimed by a file of this batch
+  final Set<String> outputPaths = {};
+
+  _ConversionBatch({
+    required this.settingsKey,
+    required this.outputDirectory,
+    required this.outputSuffix,
+  });
+}
+
+/// Input and output state of a file's last successful conversion
+class _ConversionRecord {
+  final String inputPath;
+  final String settingsKey;
+  final DateTime inputModified;
+  final DateTime outputModified;
+
+  const _ConversionRecord({
+    required this.inputPath,
+    required this.settingsKey,
+    required this.inputModified,
+    required this.outputModified,
+  });
+}
+
+/// One notebook to convert, sent to a background isolate
+class _ConversionTask {
+  final String inputPath;
+  final String outputPath;
+  // Base name already computed for the output path, reused as the HTML title
+  final String title;
+
+  const _ConversionTask({
+    required this.inputPath,
+    required this.outputPath,
+    required this.title,
+  });
+}
+
+/// Background isolate that converts notebooks one at a time for the length
+/// of a batch
+class _ConversionWorker {
+  final Isolate _isolate;
+  final ReceivePort _responses;
+  final StreamIterator<Object?> _results;
+  final SendPort _requests;
+  // Uncaught error reported just before the isolate exited, if any
+  RemoteError? _uncaughtError;
+
+  /// False once the isolate has exited; the batch stops handing it files
+  bool isAlive = true;
+
+  /// Sent on [_responses] when the isolate exits, for whatever reason
+  static const String _exited = 'exited';
+
+  _ConversionWorker._(this._isolate, this._responses, this._results, this._requests);
+
+  /// Start a worker isolate running [entryPoint], which converts every
+  /// file of the batch with [settings]
+  static Future<_ConversionWorker> spawn(
+    void Function((SendPort, ConversionSettings)) entryPoint,
+    ConversionSettings settings,
+  ) async {
+    final responses = ReceivePort();
+    // Spawned paused so the exit and error listeners are in place before
+    // any of the worker's code runs
+    final isolate = await Isolate.spawn(
+      entryPoint,
+      (responses.sendPort, settings),
+      paused: true,
+    );
+    isolate.addOnExitListener(responses.sendPort, response: _exited);
+    isolate.addErrorListener(responses.sendPort);
+    isolate.resume(isolate.pauseCapability!);
+
+    final results = StreamIterator<Object?>(responses);
+    await results.moveNext();
+    final requests = results.current;
+    if (requests is! SendPort) {
+      responses.close();
+      throw StateError('Conversion worker failed to start');
+    }
+    return _ConversionWorker._(isolate, responses, results, requests);
+  }
+
+  /// Convert one notebook, completing when its HTML has been written.
+  /// Failures in the isolate are rethrown as [RemoteError]; if the isolate
+  /// dies instead of answering, the task fails rather than waiting forever
+  Future<void> convert(_ConversionTask task) async {
+    _requests.send(task);
+    while (await _results.moveNext()) {
+      switch (_results.current) {
+        case null:
+          return;
+        case (final String error, final String stackTrace):
+          throw RemoteError(error, stackTrace);
+        case [final String error, final String? stackTrace]:
+          // Uncaught in the isolate, which is fatal; the exit follows
+          _uncaughtError = RemoteError(error, stackTrace ?? '');
+        case _exited:
+          isAlive = false;
+          throw _uncaughtError ?? StateError('Conversion worker stopped unexpectedly');
+      }
+    }
+    isAlive = false;
+    throw StateError('Conversion worker was closed');
+  }
+
+  void close() {
+    isAlive = false;
+    _responses.close();
+    _isolate.kill();
+  }
+}
+
+/// Entry point of a [_ConversionWorker] isolate. Replies to each task with
+/// null on success or an (error, stack trace) record on failure
+void _conversionWorkerMain((SendPort, ConversionSettings) args) {
+  final (responses, settings) = args;
+  // One converter for the whole batch; tasks carry only file paths
+  final converter = NotebookConverter(settings: settings);
+  final requests = ReceivePort();
+  responses.send(requests.sendPort);
+  // Runs while the batch is being set up, ahead of the first task. It's only
+  // an optimization, so a failure must not take the worker down with it
+  try {
+    converter.warmUp();
+  } catch (e) {
+    debugPrint('Conversion worker warm-up failed: $e');
+  }
+  requests.listen((message) async {
+    try {
+      await _convertNotebookFile(converter, message as _ConversionTask);
+      responses.send(null);
+    } catch (e, stackTrace) {
+      responses.send((e.toString(), stackTrace.toString()));
+    }
+  });
+}
+
+/// Convert a single notebook file; runs on a [_ConversionWorker] isolate
+Future<void> _convertNotebookFile(
+  NotebookConverter converter,
+  _ConversionTask task,
+) async {
+  final notebook = await converter.loadNotebook(task.inputPath);
+  // Rendered into a file next to the output and moved over it once
+  // complete, so a failed conversion never truncates the previous HTML
+  final partial = File('${task.outputPath}.part');
+  final sink = HtmlFileSink(partial.path);
+  try {
+    try {
+      converter.writeHtml(
+        notebook,
+        sink,
+        title: task.title,
+      );
+    } finally {
+      sink.close();
+    }
+    await partial.rename(task.outputPath);
+  } catch (_) {
+    if (partial.existsSync()) partial.deleteSync();
+    rethrow;
+  }
+}
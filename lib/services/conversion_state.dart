@@ -1,37 +1,24 @@
+import 'dart:async';
+import 'dart:collection';
 import 'dart:io';
 import 'dart:convert';
 import 'package:flutter/foundation.dart';
 import 'package:path/path.dart' as p;
 import 'package:path_provider/path_provider.dart';
-import '../models/notebook.dart';
+import '../models/conversion_file.dart';
 import '../models/custom_theme.dart';
+import 'batch_converter.dart';
 import 'notebook_converter.dart';
 
 export 'notebook_converter.dart' show HtmlTheme;
+export '../models/conversion_file.dart';
 export '../models/custom_theme.dart';
 
-/// Represents a file to be converted
-class ConversionFile {
-  final String path;
-  final String name;
-  ConversionStatus status;
-  String? error;
-  String? outputPath;
-
-  ConversionFile({
-    required this.path,
-    required this.name,
-    this.status = ConversionStatus.pending,
-    this.error,
-    this.outputPath,
-  });
-}
-
-enum ConversionStatus { pending, converting, completed, failed }
-
 /// State management for the conversion process
 class ConversionState extends ChangeNotifier {
   final List<ConversionFile> _files = [];
+  // Paths already queued, for constant-time duplicate checks
+  final Set<String> _paths = {};
   bool _isConverting = false;
   String? _outputDirectory;
   
@@ -43,9 +30,18 @@ class ConversionState extends ChangeNotifier {
   bool _useCustomTheme = false;
   CustomTheme? _customTheme;
   List<CustomTheme> _savedCustomThemes = [];
+  // Runs the batches; keeps its conversion cache across them
+  final BatchConverter _batchConverter = BatchConverter();
+  // Last scan of each dropped or selected folder
+  final Map<String, _FolderScan> _scanCache = {};
+  // Bumped on every settings change so settings widgets can skip the
+  // per-file progress notifications
+  int _settingsRevision = 0;
 
   // Getters
-  List<ConversionFile> get files => List.unmodifiable(_files);
+  // A read-only view rather than a copy: the file list reads files[index]
+  // per item, which made every rebuild copy the list once per row
+  List<ConversionFile> get files => UnmodifiableListView(_files);
   bool get isConverting => _isConverting;
   String? get outputDirectory => _outputDirectory;
   bool get embedImages => _embedImages;
@@ -55,92 +51,115 @@ class ConversionState extends ChangeNotifier {
   bool get useCustomTheme => _useCustomTheme;
   CustomTheme? get customTheme => _customTheme;
   List<CustomTheme> get savedCustomThemes => List.unmodifiable(_savedCustomThemes);
+  int get settingsRevision => _settingsRevision;
   
-  int get pendingCount => _files.where((f) => f.status == ConversionStatus.pending).length;
-  int get completedCount => _files.where((f) => f.status == ConversionStatus.completed).length;
-  int get failedCount => _files.where((f) => f.status == ConversionStatus.failed).length;
+  int get pendingCount => _statusCounts[ConversionStatus.pending.index];
+  int get completedCount => _statusCounts[ConversionStatus.completed.index];
+  int get failedCount => _statusCounts[ConversionStatus.failed.index];
   bool get hasFiles => _files.isNotEmpty;
 
+  // Files per status (indexed by ConversionStatus.index), tallied in a single
+  // pass on first read and dropped whenever listeners are notified
+  List<int>? _cachedStatusCounts;
+
+  List<int> get _statusCounts {
+    return _cachedStatusCounts ??= () {
+      final counts = List.filled(ConversionStatus.values.length, 0);
+      for (final file in _files) {
+        counts[file.status.index]++;
+      }
+      return counts;
+    }();
+  }
+
+  @override
+  void notifyListeners() {
+    _cachedStatusCounts = null;
+    super.notifyListeners();
+  }
+
   /// Add files to conversion queue
-  void addFiles(List<String> paths) {
+  Future<void> addFiles(List<String> paths) async {
     for (final path in paths) {
       // Check if it's a .ipynb file
-      if (path.toLowerCase().endsWith('.ipynb')) {
-        // Avoid duplicates
-        if (!_files.any((f) => f.path == path)) {
-          _files.add(ConversionFile(
-            path: path,
-            name: p.basename(path),
-          ));
-        }
-      } else if (FileSystemEntity.isDirectorySync(path)) {
+      if (_isNotebookPath(path)) {
+        _addFile(path);
+      } else if (await FileSystemEntity.isDirectory(path)) {
         // Recursively find .ipynb files in directory
-        _addFilesFromDirectory(path);
+        await _addFilesFromDirectory(path);
       }
     }
     notifyListeners();
   }
 
-  void _addFilesFromDirectory(String dirPath) {
+  Future<void> _addFilesFromDirectory(String dirPath) async {
     try {
-      final dir = Directory(dirPath);
-      for (final entity in dir.listSync(recursive: true)) {
-        if (entity is File && entity.path.toLowerCase().endsWith('.ipynb')) {
-          if (!_files.any((f) => f.path == entity.path)) {
-            _files.add(ConversionFile(
-              path: entity.path,
-              name: p.basename(entity.path),
-            ));
-          }
-        }
-      }
+      // Walked on a background isolate so large trees don't load the UI
+      // isolate with one event per directory entry. A folder dropped again
+      // reuses its last scan when none of its directories changed
+      final scan = await compute(_scanFolder, (dirPath, _scanCache[dirPath]));
+      _scanCache[dirPath] = scan;
+      scan.notebooks.forEach(_addFile);
     } catch (e) {
       debugPrint('Error scanning directory: $e');
     }
   }
 
+  static bool _isNotebookPath(String path) =>
+      path.toLowerCase().endsWith('.ipynb');
+
+  /// Queue a notebook unless it is already queued
+  void _addFile(String path) {
+    if (!_paths.add(path)) return;
+    _files.add(ConversionFile(
+      path: path,
+      name: p.basename(path),
+    ));
+  }
+
   /// Remove a file from the queue
   void removeFile(ConversionFile file) {
-    _files.remove(file);
+    if (_files.remove(file)) _paths.remove(file.path);
     notifyListeners();
   }
 
   /// Clear all files
   void clearFiles() {
     _files.clear();
+    _paths.clear();
     notifyListeners();
   }
 
   /// Set output directory
   void setOutputDirectory(String? path) {
     _outputDirectory = path;
-    notifyListeners();
+    _notifySettingsChanged();
   }
 
   /// Update settings
   void setEmbedImages(bool value) {
     _embedImages = value;
-    notifyListeners();
+    _notifySettingsChanged();
   }
 
   void setIncludeInput(bool value) {
     _includeInput = value;
-    notifyListeners();
+    _notifySettingsChanged();
   }
 
   void setTheme(HtmlTheme value) {
     _theme = value;
-    notifyListeners();
+    _notifySettingsChanged();
   }
 
   void setAppendThemeName(bool value) {
     _appendThemeName = value;
-    notifyListeners();
+    _notifySettingsChanged();
   }
 
   void setUseCustomTheme(bool value) {
     _useCustomTheme = value;
-    notifyListeners();
+    _notifySettingsChanged();
   }
 
   void setCustomTheme(CustomTheme? theme) {
@@ -148,7 +167,7 @@ class ConversionState extends ChangeNotifier {
     if (theme != null) {
       _useCustomTheme = true;
     }
-    notifyListeners();
+    _notifySettingsChanged();
   }
 
   Future<void> saveCustomTheme(CustomTheme theme) async {
@@ -158,7 +177,7 @@ class ConversionState extends ChangeNotifier {
     _customTheme = theme;
     _useCustomTheme = true;
     await _persistCustomThemes();
-    notifyListeners();
+    _notifySettingsChanged();
   }
 
   Future<void> deleteCustomTheme(CustomTheme theme) async {
@@ -170,7 +189,7 @@ class ConversionState extends ChangeNotifier {
       }
     }
     await _persistCustomThemes();
-    notifyListeners();
+    _notifySettingsChanged();
   }
 
   Future<void> loadCustomThemes() async {
@@ -183,13 +202,18 @@ class ConversionState extends ChangeNotifier {
         _savedCustomThemes = jsonList
             .map((json) => CustomTheme.fromJson(json as Map<String, dynamic>))
             .toList();
-        notifyListeners();
+        _notifySettingsChanged();
       }
     } catch (e) {
       debugPrint('Error loading custom themes: $e');
     }
   }
 
+  void _notifySettingsChanged() {
+    _settingsRevision++;
+    notifyListeners();
+  }
+
   Future<void> _persistCustomThemes() async {
     try {
       final dir = await getApplicationDocumentsDirectory();
@@ -201,67 +225,65 @@ class ConversionState extends ChangeNotifier {
     }
   }
 
-  /// Start conversion process
-  Future<void> convertAll() async {
+  /// Minimum gap between UI updates for per-file progress
+  static const Duration _progressInterval = Duration(milliseconds: 50);
+  Timer? _progressTimer;
+  final Stopwatch _sinceProgress = Stopwatch();
+
+  /// Coalesce progress updates so a batch of fast conversions triggers at
+  /// most one rebuild per [_progressInterval]. An update after a quiet
+  /// period is shown immediately; only bursts wait for the trailing timer
+  void _notifyProgress() {
+    if (_progressTimer != null) return;
+    final elapsed = _sinceProgress.elapsed;
+    if (!_sinceProgress.isRunning || elapsed >= _progressInterval) {
+      _sinceProgress
+        ..reset()
+        ..start();
+      notifyListeners();
+      return;
+    }
+    _progressTimer = Timer(_progressInterval - elapsed, () {
+      _progressTimer = null;
+      _sinceProgress
+        ..reset()
+        ..start();
+      notifyListeners();
+    });
+  }
+
+  /// Start conversion process, converting up to [maxWorkers] files at once
+  /// (see [BatchConverter.defaultWorkers])
+  Future<void> convertAll({int? maxWorkers}) async {
     if (_isConverting || _files.isEmpty) return;
     
     _isConverting = true;
     notifyListeners();
 
-    final converter = NotebookConverter(
-      settings: ConversionSettings(
-        embedImages: _embedImages,
-        includeInput: _includeInput,
-        theme: _theme,
-        customTheme: _useCustomTheme ? _customTheme : null,
-      ),
+    final settings = ConversionSettings(
+      embedImages: _embedImages,
+      includeInput: _includeInput,
+      theme: _theme,
+      customTheme: _useCustomTheme ? _customTheme : null,
+    );
+    // Output location and naming are read once for the whole batch, so
+    // nothing is re-derived per file and changing a setting mid-batch can't
+    // mix two naming schemes
+    final themeName = _useCustomTheme && _customTheme != null
+        ? _customTheme!.name.replaceAll(' ', '_')
+        : _theme.name;
+    // Snapshot the list since files may be removed mid-batch
+    await _batchConverter.convert(
+      _files.toList(),
+      settings: settings,
+      outputDirectory: _outputDirectory,
+      outputSuffix: _appendThemeName ? '_$themeName.html' : '.html',
+      maxWorkers: maxWorkers,
+      onProgress: _notifyProgress,
     );
 
-    for (final file in _files) {
-      // Always allow conversion (don't skip completed - user may want different theme)
-      file.status = ConversionStatus.converting;
-      file.error = null;
-      notifyListeners();
-
-      try {
-        // Read the notebook file
-        final content = await File(file.path).readAsString();
-        
-        // Parse and convert
-        final notebook = converter.parseNotebook(content);
-        final html = converter.convertToHtml(
-          notebook,
-          title: p.basenameWithoutExtension(file.path),
-        );
-
-        // Determine output path
-        final outputDir = _outputDirectory ?? p.dirname(file.path);
-        final baseName = p.basenameWithoutExtension(file.path);
-        final themeName = _useCustomTheme && _customTheme != null 
-            ? _customTheme!.name.replaceAll(' ', '_')
-            : _theme.name;
-        final outputName = _appendThemeName 
-            ? '${baseName}_$themeName.html'
-            : '$baseName.html';
-        final outputPath = p.join(outputDir, outputName);
-
-        // Ensure output directory exists
-        await Directory(outputDir).create(recursive: true);
-
-        // Write HTML file
-        await File(outputPath).writeAsString(html);
-
-        file.status = ConversionStatus.completed;
-        file.outputPath = outputPath;
-      } catch (e) {
-        file.status = ConversionStatus.failed;
-        file.error = e.toString();
-        debugPrint('Conversion error for ${file.name}: $e');
-      }
-
-      notifyListeners();
-    }
-
+    _progressTimer?.cancel();
+    _progressTimer = null;
     _isConverting = false;
     notifyListeners();
   }
@@ -286,5 +308,77 @@ class ConversionState extends ChangeNotifier {
     }
     notifyListeners();
   }
+
+  @override
+  void dispose() {
+    _progressTimer?.cancel();
+    super.dispose();
+  }
 }
 
+/// Directories never searched for notebooks: checkpoint copies, VCS and
+/// dependency trees
+const Set<String> _skippedDirectories = {
+  '.ipynb_checkpoints',
+  '.git',
+  'node_modules',
+  '__pycache__',
+};
+
+/// Coarsest directory timestamp in common use (FAT keeps 2 s). Two changes
+/// within one such tick can leave a directory's modification time unchanged
+const Duration _modifiedTimeResolution = Duration(seconds: 2);
+
+/// Notebooks found under a folder, with the modification time of every
+/// directory walked to find them
+class _FolderScan {
+  final Map<String, DateTime> directories;
+  final List<String> notebooks;
+  // When the walk started, to tell which directory times can be trusted
+  final DateTime startedAt;
+
+  const _FolderScan(this.directories, this.notebooks, this.startedAt);
+}
+
+/// Find the notebooks under a folder, skipping hidden directories and
+/// [_skippedDirectories]. Links aren't followed: entity types come straight
+/// from the directory listing instead of an extra stat per entry, and link
+/// cycles can't recurse.
+///
+/// The previous scan of the folder, if given, is returned as-is when none of
+/// its directories changed: adding, removing or renaming an entry updates
+/// its directory's modification time, so one stat per directory replaces
+/// listing the whole tree. A directory modified within
+/// [_modifiedTimeResolution] of the previous scan could have changed again
+/// in the same timestamp tick, so it always gets walked again
+_FolderScan _scanFolder((String, _FolderScan?) args) {
+  final (dirPath, previous) = args;
+  if (previous != null &&
+      previous.directories.entries.every(
+        (dir) =>
+            previous.startedAt.difference(dir.value) > _modifiedTimeResolution &&
+            FileStat.statSync(dir.key).modified == dir.value,
+      )) {
+    return previous;
+  }
+
+  final startedAt = DateTime.now();
+  final directories = <String, DateTime>{};
+  final notebooks = <String>[];
+  void visit(Directory dir) {
+    directories[dir.path] = dir.statSync().modified;
+    for (final entity in dir.listSync(followLinks: false)) {
+      if (entity is Directory) {
+        final name = p.basename(entity.path);
+        if (!name.startsWith('.') && !_skippedDirectories.contains(name)) {
+          visit(entity);
+        }
+      } else if (entity is File && ConversionState._isNotebookPath(entity.path)) {
+        notebooks.add(entity.path);
+      }
+    }
+  }
+
+  visit(Directory(dirPath));
+  return _FolderScan(directories, notebooks, startedAt);
+}
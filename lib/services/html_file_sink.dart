@@ -0,0 +1,74 @@
+import 'dart:io';
+
+/// [StringSink] that streams HTML to a file in large chunks, so a converted
+/// notebook is never held in memory as one string.
+///
+/// Writes are synchronous; use it from a background isolate.
+class HtmlFileSink implements StringSink, Sink<List<int>> {
+  /// Characters buffered before they are written to the file
+  static const int _chunkSize = 1 << 16;
+
+  final RandomAccessFile _file;
+  final StringBuffer _buffer = StringBuffer();
+
+  HtmlFileSink(String path) : _file = File(path).openSync(mode: FileMode.write);
+
+  @override
+  void write(Object? object) {
+    // Large blobs (embedded images) go straight to the file rather than
+    // being copied through the buffer first
+    if (object is String && object.length >= _chunkSize) {
+      flush();
+      _file.writeStringSync(object);
+      return;
+    }
+    _buffer.write(object);
+    _flushIfFull();
+  }
+
+  @override
+  void writeAll(Iterable<dynamic> objects, [String separator = '']) {
+    _buffer.writeAll(objects, separator);
+    _flushIfFull();
+  }
+
+  @override
+  void writeln([Object? object = '']) {
+    _buffer.writeln(object);
+    _flushIfFull();
+  }
+
+  @override
+  void writeCharCode(int charCode) {
+    _buffer.writeCharCode(charCode);
+    _flushIfFull();
+  }
+
+  /// Write already-encoded UTF-8 bytes, after any buffered text
+  @override
+  void add(List<int> bytes) {
+    flush();
+    _file.writeFromSync(bytes);
+  }
+
+  void _flushIfFull() {
+    if (_buffer.length >= _chunkSize) flush();
+  }
+
+  /// Write any buffered text to the file
+  void flush() {
+    if (_buffer.isEmpty) return;
+    _file.writeStringSync(_buffer.toString());
+    _buffer.clear();
+  }
+
+  /// Flush remaining text and close the file
+  @override
+  void close() {
+    try {
+      flush();
+    } finally {
+      _file.closeSync();
+    }
+  }
+}
@@ -1,4 +1,5 @@
 import 'dart:convert';
+import 'dart:io';
 import 'package:markdown/markdown.dart' as md;
 import 'package:highlight/highlight.dart' show highlight;
 import 'package:highlight/languages/python.dart' as python_lang;
@@ -56,21 +57,58 @@ class NotebookConverter {
     return Notebook.fromJson(json);
   }
 
+  // Decodes UTF-8 and parses JSON in one pass, without building the file
+  // contents as an intermediate String
+  static final Converter<List<int>, Object?> _jsonBytesDecoder =
+      utf8.decoder.fuse(json.decoder);
+
+  /// Parse raw (UTF-8) notebook file bytes into Notebook object
+  Notebook parseNotebookBytes(List<int> bytes) {
+    final json = _jsonBytesDecoder.convert(bytes) as Map<String, dynamic>;
+    return Notebook.fromJson(json);
+  }
+
+  /// Read and parse a notebook file; the one place notebooks are loaded
+  Future<Notebook> loadNotebook(String path) async {
+    return parseNotebookBytes(await File(path).readAsBytes());
+  }
+
+  /// Initialize lazily built state (the fused JSON decoder, highlight
+  /// grammars, markdown rendering and this converter's custom theme CSS) by
+  /// converting a tiny notebook, so the first real file doesn't pay for it
+  void warmUp() {
+    final notebook = parseNotebookBytes(utf8.encode(_warmUpNotebook));
+    writeHtml(notebook, StringBuffer());
+  }
+
+  static const String _warmUpNotebook = '{"cells": ['
+      '{"cell_type": "markdown", "metadata": {}, "source": ["# Warm-up"]}, '
+      '{"cell_type": "code", "metadata": {}, "execution_count": 1, '
+      '"source": ["print(1)"], "outputs": ['
+      '{"output_type": "stream", "name": "stdout", "text": ["1"]}]}], '
+      '"metadata": {}, "nbformat": 4, "nbformat_minor": 5}';
+
   /// Convert notebook to HTML
   String convertToHtml(Notebook notebook, {String? title}) {
     final buffer = StringBuffer();
-    
+    writeHtml(notebook, buffer, title: title);
+    return buffer.toString();
+  }
+
+  /// Convert notebook to HTML, writing it directly into [buffer]
+  void writeHtml(Notebook notebook, StringSink buffer, {String? title}) {
     buffer.writeln('<!DOCTYPE html>');
     buffer.writeln('<html lang="en">');
     buffer.writeln('<head>');
     buffer.writeln('  <meta charset="UTF-8">');
     buffer.writeln('  <meta name="viewport" content="width=device-width, initial-scale=1.0">');
     buffer.writeln('  <title>${_escapeHtml(title ?? 'Jupyter Notebook')}</title>');
-    buffer.writeln(_getStyles());
+    _writeStyles(buffer);
     // Add custom theme CSS if provided
-    if (settings.customTheme != null) {
+    final customThemeCss = _customThemeCss;
+    if (customThemeCss != null) {
       buffer.writeln('<style>');
-      buffer.writeln(settings.customTheme!.toCss());
+      buffer.writeln(customThemeCss);
       buffer.writeln('</style>');
     }
     buffer.writeln('</head>');
@@ -79,46 +117,41 @@ class NotebookConverter {
     buffer.writeln('  <div class="notebook-container">');
     
     for (var i = 0; i < notebook.cells.length; i++) {
-      final cell = notebook.cells[i];
-      buffer.writeln(_convertCell(cell, i));
+      _writeCell(buffer, notebook.cells[i], i);
     }
     
     buffer.writeln('  </div>');
     buffer.writeln('</body>');
     buffer.writeln('</html>');
-    
-    return buffer.toString();
   }
 
-  String _convertCell(Cell cell, int index) {
+  // Cells and outputs are written straight into the document sink rather
+  // than rendered to intermediate strings and copied in afterwards
+  void _writeCell(StringSink buffer, Cell cell, int index) {
     switch (cell.cellType) {
       case CellType.markdown:
-        return _convertMarkdownCell(cell, index);
+        _writeMarkdownCell(buffer, cell, index);
       case CellType.code:
-        return _convertCodeCell(cell, index);
+        _writeCodeCell(buffer, cell, index);
       case CellType.raw:
-        return _convertRawCell(cell, index);
+        _writeRawCell(buffer, cell, index);
     }
   }
 
-  String _convertMarkdownCell(Cell cell, int index) {
+  void _writeMarkdownCell(StringSink buffer, Cell cell, int index) {
     final html = md.markdownToHtml(
       cell.sourceText,
       extensionSet: md.ExtensionSet.gitHubWeb,
     );
     
-    return '''
-    <div class="cell markdown-cell" data-cell-index="$index">
-      <div class="cell-content markdown-content">
-        $html
-      </div>
-    </div>
-    ''';
+    buffer.writeln('<div class="cell markdown-cell" data-cell-index="$index">');
+    buffer.writeln('  <div class="cell-content markdown-content">');
+    buffer.writeln(html);
+    buffer.writeln('  </div>');
+    buffer.writeln('</div>');
   }
 
-  String _convertCodeCell(Cell cell, int index) {
-    final buffer = StringBuffer();
-    
+  void _writeCodeCell(StringSink buffer, Cell cell, int index) {
     buffer.writeln('<div class="cell code-cell" data-cell-index="$index">');
     
     if (settings.includeInput) {
@@ -137,52 +170,45 @@ class NotebookConverter {
       buffer.writeln('  <div class="cell-output">');
       
       for (final output in cell.outputs!) {
-        buffer.writeln(_convertOutput(output, cell.executionCount));
+        _writeOutput(buffer, output, cell.executionCount);
       }
       
       buffer.writeln('  </div>');
     }
     
     buffer.writeln('</div>');
-    return buffer.toString();
   }
 
-  String _convertRawCell(Cell cell, int index) {
-    return '''
-    <div class="cell raw-cell" data-cell-index="$index">
-      <div class="cell-content raw-content">
-        <pre>${_escapeHtml(cell.sourceText)}</pre>
-      </div>
-    </div>
-    ''';
+  void _writeRawCell(StringSink buffer, Cell cell, int index) {
+    buffer.writeln('<div class="cell raw-cell" data-cell-index="$index">');
+    buffer.writeln('  <div class="cell-content raw-content">');
+    buffer.writeln('    <pre>${_escapeHtml(cell.sourceText)}</pre>');
+    buffer.writeln('  </div>');
+    buffer.writeln('</div>');
   }
 
-  String _convertOutput(CellOutput output, int? executionCount) {
+  void _writeOutput(StringSink buffer, CellOutput output, int? executionCount) {
     switch (output.outputType) {
       case OutputType.stream:
-        return _convertStreamOutput(output);
+        _writeStreamOutput(buffer, output);
       case OutputType.displayData:
       case OutputType.executeResult:
-        return _convertDisplayOutput(output, executionCount);
+        _writeDisplayOutput(buffer, output, executionCount);
       case OutputType.error:
-        return _convertErrorOutput(output);
+        _writeErrorOutput(buffer, output);
     }
   }
 
-  String _convertStreamOutput(CellOutput output) {
+  void _writeStreamOutput(StringSink buffer, CellOutput output) {
     final isError = output.name == 'stderr';
     final cssClass = isError ? 'output-stderr' : 'output-stdout';
     
-    return '''
-    <div class="output-item $cssClass">
-      <pre>${_escapeHtml(output.text ?? '')}</pre>
-    </div>
-    ''';
+    buffer.writeln('<div class="output-item $cssClass">');
+    buffer.writeln('  <pre>${_escapeHtml(output.text ?? '')}</pre>');
+    buffer.writeln('</div>');
   }
 
-  String _convertDisplayOutput(CellOutput output, int? executionCount) {
-    final buffer = StringBuffer();
-    
+  void _writeDisplayOutput(StringSink buffer, CellOutput output, int? executionCount) {
     if (output.outputType == OutputType.executeResult && executionCount != null) {
       buffer.writeln('<div class="execution-count output-count">Out [$executionCount]:</div>');
     }
@@ -191,19 +217,29 @@ class NotebookConverter {
     if (images.isNotEmpty) {
       for (final entry in images.entries) {
         final mimeType = entry.key;
-        final data = entry.value.trim();
+        // Parts are streamed one by one rather than joined, so the payload
+        // is never copied into a single string
+        final parts = entry.value;
         
         if (mimeType == 'image/svg+xml') {
           buffer.writeln('<div class="output-item output-image">');
-          buffer.writeln(data);
+          for (final part in parts) {
+            buffer.write(part);
+          }
+          buffer.writeln();
           buffer.writeln('</div>');
         } else {
           buffer.writeln('<div class="output-item output-image">');
-          buffer.writeln('  <img src="data:$mimeType;base64,$data" alt="Output">');
+          buffer.write('  <img src="data:$mimeType;base64,');
+          for (final part in parts) {
+            // Base64 lines may end in newlines, which don't belong in a URI
+            buffer.write(part.trim());
+          }
+          buffer.writeln('" alt="Output">');
           buffer.writeln('</div>');
         }
       }
-      return buffer.toString();
+      return;
     }
     
     final htmlContent = output.getHtmlContent();
@@ -211,7 +247,7 @@ class NotebookConverter {
       buffer.writeln('<div class="output-item output-html">');
       buffer.writeln(htmlContent);
       buffer.writeln('</div>');
-      return buffer.toString();
+      return;
     }
     
     final textContent = output.getTextContent();
@@ -219,15 +255,10 @@ class NotebookConverter {
       buffer.writeln('<div class="output-item output-text">');
       buffer.writeln('<pre>${_escapeHtml(textContent)}</pre>');
       buffer.writeln('</div>');
-      return buffer.toString();
     }
-    
-    return buffer.toString();
   }
 
-  String _convertErrorOutput(CellOutput output) {
-    final buffer = StringBuffer();
-    
+  void _writeErrorOutput(StringSink buffer, CellOutput output) {
     buffer.writeln('<div class="output-item output-error">');
     buffer.writeln('  <div class="error-header">${_escapeHtml(output.ename ?? 'Error')}: ${_escapeHtml(output.evalue ?? '')}</div>');
     
@@ -240,16 +271,24 @@ class NotebookConverter {
     }
     
     buffer.writeln('</div>');
-    return buffer.toString();
+  }
+
+  // Grammars are registered once per isolate, not once per code cell
+  static bool _languagesRegistered = false;
+
+  static void _registerLanguages() {
+    if (_languagesRegistered) return;
+    highlight.registerLanguage('python', python_lang.python);
+    highlight.registerLanguage('javascript', js_lang.javascript);
+    highlight.registerLanguage('sql', sql_lang.sql);
+    highlight.registerLanguage('bash', bash_lang.bash);
+    highlight.registerLanguage('json', json_lang.json);
+    _languagesRegistered = true;
   }
 
   String _highlightCode(String code, String language) {
     try {
-      highlight.registerLanguage('python', python_lang.python);
-      highlight.registerLanguage('javascript', js_lang.javascript);
-      highlight.registerLanguage('sql', sql_lang.sql);
-      highlight.registerLanguage('bash', bash_lang.bash);
-      highlight.registerLanguage('json', json_lang.json);
+      _registerLanguages();
       
       final result = highlight.parse(code, language: language);
       return result.toHtml();
@@ -258,21 +297,45 @@ class NotebookConverter {
     }
   }
 
+  // Escapes & < > " ' in a single scan instead of one replaceAll per character
+  static const HtmlEscape _htmlEscape = HtmlEscape(
+    HtmlEscapeMode(
+      escapeLtGt: true,
+      escapeQuot: true,
+      escapeApos: true,
+    ),
+  );
+
   String _escapeHtml(String text) {
-    return text
-        .replaceAll('&', '&amp;')
-        .replaceAll('<', '&lt;')
-        .replaceAll('>', '&gt;')
-        .replaceAll('"', '&quot;')
-        .replaceAll("'", '&#39;');
+    return _htmlEscape.convert(text);
   }
 
+  static final RegExp _ansiEscape = RegExp(r'\x1B\[[0-9;]*[a-zA-Z]');
+
   String _stripAnsi(String text) {
-    return text.replaceAll(RegExp(r'\x1B\[[0-9;]*[a-zA-Z]'), '');
+    // Most lines carry no escape codes; a plain scan skips the regex for them
+    if (!text.contains('\x1B')) return text;
+    return text.replaceAll(_ansiEscape, '');
+  }
+
+  // Custom theme CSS depends only on the settings, so it is rendered once and
+  // reused for every file this converter writes
+  late final String? _customThemeCss = settings.customTheme?.toCss();
+
+  // The stylesheet is the same for every file, so it is encoded once per
+  // isolate and byte sinks (files) receive it without re-encoding
+  static final List<int> _stylesBytes = utf8.encode(_styles);
+
+  void _writeStyles(StringSink buffer) {
+    if (buffer case final Sink<List<int>> bytes) {
+      bytes.add(_stylesBytes);
+      buffer.writeln();
+    } else {
+      buffer.writeln(_styles);
+    }
   }
 
-  String _getStyles() {
-    return '''
+  static const String _styles = '''
 <style>
 /* ========== BASE STYLES ========== */
 * { box-sizing: border-box; }
@@ -601,5 +664,4 @@ body {
 }
 </style>
     ''';
-  }
 }
@@ -9,7 +9,9 @@ class SettingsPanel extends StatelessWidget {
 
   @override
   Widget build(BuildContext context) {
-    final state = context.watch<ConversionState>();
+    // Only settings changes rebuild the panel, not conversion progress
+    context.select<ConversionState, int>((s) => s.settingsRevision);
+    final state = context.read<ConversionState>();
     final colorScheme = Theme.of(context).colorScheme;
 
     return SingleChildScrollView(
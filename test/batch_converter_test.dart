@@ -0,0 +1,47 @@
+import 'dart:io';
+import 'dart:isolate';
+
+import 'package:flutter_test/flutter_test.dart';
+import 'package:path/path.dart' as p;
+
+import 'package:notebook_converter/models/conversion_file.dart';
+import 'package:notebook_converter/services/batch_converter.dart';
+import 'package:notebook_converter/services/notebook_converter.dart';
+
+void main() {
+  late Directory temp;
+
+  setUp(() async {
+    temp = await Directory.systemTemp.createTemp('batch_converter_test');
+  });
+
+  tearDown(() async {
+    await temp.delete(recursive: true);
+  });
+
+  test('fails the file instead of hanging when a worker dies', () async {
+    final input = File(p.join(temp.path, 'sample.ipynb'));
+    File('test/fixtures/sample.ipynb').copySync(input.path);
+    final file = ConversionFile(path: input.path, name: 'sample.ipynb');
+
+    await BatchConverter.withWorkerMain(_crashingWorkerMain).convert(
+      [file],
+      settings: const ConversionSettings(),
+      outputDirectory: null,
+      outputSuffix: '.html',
+      onProgress: () {},
+    );
+
+    expect(file.status, ConversionStatus.failed);
+    expect(file.error, contains('worker crashed'));
+    expect(File(p.join(temp.path, 'sample.html')).existsSync(), isFalse);
+  });
+}
+
+/// Conversion worker that starts normally, then crashes on its first task
+void _crashingWorkerMain((SendPort, ConversionSettings) args) {
+  final (responses, _) = args;
+  final requests = ReceivePort();
+  responses.send(requests.sendPort);
+  requests.listen((_) => throw StateError('worker crashed'));
+}
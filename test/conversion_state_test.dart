@@ -0,0 +1,216 @@
+import 'dart:io';
+
+import 'package:flutter_test/flutter_test.dart';
+import 'package:path/path.dart' as p;
+
+import 'package:notebook_converter/services/conversion_state.dart';
+
+void main() {
+  late Directory temp;
+  late ConversionState state;
+
+  File copyFixture(String relativePath) {
+    final file = File(p.join(temp.path, relativePath))
+      ..createSync(recursive: true);
+    File('test/fixtures/sample.ipynb').copySync(file.path);
+    return file;
+  }
+
+  File notebook(String relativePath) {
+    return File(p.join(temp.path, relativePath))
+      ..createSync(recursive: true)
+      ..writeAsStringSync('{"cells": []}');
+  }
+
+  Future<Set<String>> scan() async {
+    state.clearFiles();
+    await state.addFiles([temp.path]);
+    return {for (final file in state.files) p.relative(file.path, from: temp.path)};
+  }
+
+  // Dart can't set a directory's modification time, which the folder scan
+  // cache goes by
+  Future<void> touch(List<String> args) async {
+    final result = await Process.run('touch', args);
+    expect(result.exitCode, 0, reason: '${result.stderr}');
+  }
+
+  setUp(() async {
+    temp = await Directory.systemTemp.createTemp('conversion_state_test');
+    state = ConversionState();
+  });
+
+  tearDown(() async {
+    state.dispose();
+    await temp.delete(recursive: true);
+  });
+
+  group('addFiles', () {
+    test('scans folders, skipping checkpoint, dependency and hidden directories', () async {
+      notebook('a.ipynb');
+      notebook(p.join('sub', 'b.IPYNB'));
+      notebook(p.join('.ipynb_checkpoints', 'a-checkpoint.ipynb'));
+      notebook(p.join('node_modules', 'pkg', 'c.ipynb'));
+      notebook(p.join('.hidden', 'd.ipynb'));
+      File(p.join(temp.path, 'notes.txt')).writeAsStringSync('');
+
+      expect(await scan(), {'a.ipynb', p.join('sub', 'b.IPYNB')});
+    });
+
+    test('does not queue the same notebook twice', () async {
+      final file = notebook('a.ipynb');
+
+      await state.addFiles([file.path, temp.path, file.path]);
+
+      expect(state.files, hasLength(1));
+    });
+
+    test('reuses the scan of an unchanged tree', () async {
+      final sub = p.join(temp.path, 'sub');
+      notebook('a.ipynb');
+      notebook(p.join('sub', 'b.ipynb'));
+      // Modified long before the scan, so the cached scan can be trusted
+      await touch(['-t', '202001010000', temp.path, sub]);
+      expect(await scan(), {'a.ipynb', p.join('sub', 'b.ipynb')});
+
+      // Renamed with the directory's time put back: only a walk would
+      // notice, so the stale name shows the walk was skipped
+      File(p.join(sub, 'b.ipynb')).renameSync(p.join(sub, 'c.ipynb'));
+      await touch(['-t', '202001010000', sub]);
+
+      expect(await scan(), {'a.ipynb', p.join('sub', 'b.ipynb')});
+    }, skip: Platform.isWindows);
+
+    test('walks directories modified just before the last scan again', () async {
+      final sub = p.join(temp.path, 'sub');
+      notebook(p.join('sub', 'b.ipynb'));
+      expect(await scan(), {p.join('sub', 'b.ipynb')});
+
+      // Same rename as above, but the directory time is within a timestamp
+      // tick of the scan, where a second change may not move it
+      final saved = File('${temp.path}.mtime')..createSync();
+      addTearDown(saved.deleteSync);
+      await touch(['-r', sub, saved.path]);
+      File(p.join(sub, 'b.ipynb')).renameSync(p.join(sub, 'c.ipynb'));
+      await touch(['-r', saved.path, sub]);
+
+      expect(await scan(), {p.join('sub', 'c.ipynb')});
+    }, skip: Platform.isWindows);
+
+    test('rescans when a nested directory changes', () async {
+      notebook(p.join('sub', 'deep', 'a.ipynb'));
+      expect(await scan(), {p.join('sub', 'deep', 'a.ipynb')});
+
+      notebook(p.join('sub', 'deep', 'b.ipynb'));
+      expect(await scan(), {
+        p.join('sub', 'deep', 'a.ipynb'),
+        p.join('sub', 'deep', 'b.ipynb'),
+      });
+
+      File(p.join(temp.path, 'sub', 'deep', 'a.ipynb')).deleteSync();
+      expect(await scan(), {p.join('sub', 'deep', 'b.ipynb')});
+    });
+
+    test('rescans when a scanned directory is removed', () async {
+      notebook('a.ipynb');
+      notebook(p.join('sub', 'b.ipynb'));
+      expect(await scan(), {'a.ipynb', p.join('sub', 'b.ipynb')});
+
+      Directory(p.join(temp.path, 'sub')).deleteSync(recursive: true);
+      expect(await scan(), {'a.ipynb'});
+    });
+  });
+
+  group('convertAll', () {
+    test('gives notebooks with the same name distinct output files', () async {
+      final output = p.join(temp.path, 'html');
+      state.setOutputDirectory(output);
+      await state.addFiles([
+        copyFixture(p.join('a', 'sample.ipynb')).path,
+        copyFixture(p.join('b', 'sample.ipynb')).path,
+      ]);
+
+      await state.convertAll();
+
+      expect(state.files.map((f) => f.status), everyElement(ConversionStatus.completed));
+      expect(state.files.map((f) => f.outputPath), [
+        p.join(output, 'sample_tokyoNight.html'),
+        p.join(output, 'sample (2)_tokyoNight.html'),
+      ]);
+      for (final file in state.files) {
+        expect(File(file.outputPath!).readAsStringSync().trimRight(), endsWith('</html>'));
+      }
+    });
+
+    test('keeps the previous output when a conversion fails', () async {
+      final input = copyFixture('sample.ipynb');
+      await state.addFiles([input.path]);
+      await state.convertAll();
+      final output = File(state.files.single.outputPath!);
+      final html = output.readAsStringSync();
+
+      input.writeAsStringSync('{not json');
+      await state.convertAll();
+
+      expect(state.files.single.status, ConversionStatus.failed);
+      expect(output.readAsStringSync(), html);
+      expect(
+        temp.listSync().map((e) => p.basename(e.path)),
+        unorderedEquals(['sample.ipynb', 'sample_tokyoNight.html']),
+      );
+    });
+
+    test('skips notebooks unchanged since the last conversion', () async {
+      final input = copyFixture('sample.ipynb')..setLastModifiedSync(DateTime(2024));
+      state.setAppendThemeName(false);
+      await state.addFiles([input.path]);
+      await state.convertAll();
+      expect(state.files.single.status, ConversionStatus.completed);
+
+      // Break the notebook but keep its modification time, so only a skipped
+      // conversion can still succeed
+      input
+        ..writeAsStringSync('{not json')
+        ..setLastModifiedSync(DateTime(2024));
+      await state.convertAll();
+      expect(state.files.single.status, ConversionStatus.completed);
+
+      // Different settings, same output file: converted again
+      state.setTheme(HtmlTheme.dracula);
+      await state.convertAll();
+      expect(state.files.single.status, ConversionStatus.failed);
+    });
+
+    test('converts again when the notebook changes', () async {
+      final input = copyFixture('sample.ipynb')..setLastModifiedSync(DateTime(2024));
+      await state.addFiles([input.path]);
+      await state.convertAll();
+      expect(state.files.single.status, ConversionStatus.completed);
+
+      input
+        ..writeAsStringSync('{not json')
+        ..setLastModifiedSync(DateTime(2025));
+      await state.convertAll();
+      expect(state.files.single.status, ConversionStatus.failed);
+    });
+
+    test('does not skip another notebook written to the same output', () async {
+      state.setOutputDirectory(p.join(temp.path, 'html'));
+      final first = copyFixture(p.join('a', 'sample.ipynb'))
+        ..setLastModifiedSync(DateTime(2024));
+      await state.addFiles([first.path]);
+      await state.convertAll();
+      expect(state.files.single.status, ConversionStatus.completed);
+
+      // Same name and modification time, as after extracting an archive
+      final second = File(p.join(temp.path, 'b', 'sample.ipynb'))
+        ..createSync(recursive: true)
+        ..writeAsStringSync('{not json')
+        ..setLastModifiedSync(DateTime(2024));
+      state.clearFiles();
+      await state.addFiles([second.path]);
+      await state.convertAll();
+      expect(state.files.single.status, ConversionStatus.failed);
+    });
+  });
+}
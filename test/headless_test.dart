@@ -0,0 +1,82 @@
+import 'dart:io';
+
+import 'package:flutter_test/flutter_test.dart';
+import 'package:path/path.dart' as p;
+
+import 'package:notebook_converter/headless.dart';
+
+void main() {
+  late Directory temp;
+
+  setUp(() async {
+    temp = await Directory.systemTemp.createTemp('headless_test');
+  });
+
+  tearDown(() async {
+    await temp.delete(recursive: true);
+  });
+
+  group('argument parsing', () {
+    test('--help exits with 0', () async {
+      expect(await runHeadless(['--headless', '--help']), 0);
+    });
+
+    test('unknown option is a usage error', () async {
+      expect(await runHeadless(['--headless', '--bogus']), 2);
+    });
+
+    test('option without a value is a usage error', () async {
+      expect(await runHeadless(['--headless', '--output']), 2);
+    });
+
+    test('invalid --jobs is a usage error', () async {
+      expect(await runHeadless(['--headless', '--jobs', '0', 'a.ipynb']), 2);
+      expect(await runHeadless(['--headless', '--jobs', 'many', 'a.ipynb']), 2);
+    });
+
+    test('unknown theme is a usage error', () async {
+      expect(await runHeadless(['--headless', '--theme', 'nope', 'a.ipynb']), 2);
+    });
+
+    test('no notebooks is a usage error', () async {
+      expect(await runHeadless(['--headless', temp.path]), 2);
+    });
+  });
+
+  test('converts a notebook into the output directory', () async {
+    final output = p.join(temp.path, 'html');
+
+    final code = await runHeadless([
+      '--headless',
+      'test/fixtures/sample.ipynb',
+      '--output', output,
+      '--theme', 'dracula',
+      '--jobs', '1',
+    ]);
+
+    expect(code, 0);
+    final html = File(p.join(output, 'sample_dracula.html'));
+    expect(html.existsSync(), isTrue);
+    final content = html.readAsStringSync();
+    expect(content, startsWith('<!DOCTYPE html>'));
+    expect(content, contains('<title>sample</title>'));
+    expect(content, contains('theme-dracula'));
+    expect(content, contains('Sample notebook'));
+    expect(content, contains('hello'));
+    expect(content.trimRight(), endsWith('</html>'));
+  });
+
+  test('reports failures with exit code 1', () async {
+    final broken = File(p.join(temp.path, 'broken.ipynb'))
+      ..writeAsStringSync('{not json');
+
+    final code = await runHeadless([
+      '--headless',
+      broken.path,
+      '--no-theme-name',
+    ]);
+
+    expect(code, 1);
+    expect(File(p.join(temp.path, 'broken.html')).existsSync(), isFalse);
+  });
+}
@@ -0,0 +1,83 @@
+import 'dart:convert';
+import 'dart:io';
+
+import 'package:flutter_test/flutter_test.dart';
+import 'package:path/path.dart' as p;
+
+import 'package:notebook_converter/services/html_file_sink.dart';
+
+void main() {
+  late Directory temp;
+  late String path;
+
+  setUp(() async {
+    temp = await Directory.systemTemp.createTemp('html_file_sink_test');
+    path = p.join(temp.path, 'out.html');
+  });
+
+  tearDown(() async {
+    await temp.delete(recursive: true);
+  });
+
+  test('keeps writes in order', () {
+    HtmlFileSink(path)
+      ..write('<a>')
+      ..writeln('<b>')
+      ..writeCharCode(0x41)
+      ..writeAll(['x', 'y'], ',')
+      ..close();
+
+    expect(File(path).readAsStringSync(), '<a><b>\nAx,y');
+  });
+
+  test('keeps text and bytes in write order', () {
+    HtmlFileSink(path)
+      ..write('<a>')
+      ..add(utf8.encode('<b>'))
+      ..writeln('<c>')
+      ..add(utf8.encode('é'))
+      ..write('<d>')
+      ..close();
+
+    expect(File(path).readAsStringSync(), '<a><b><c>\né<d>');
+  });
+
+  test('keeps writes in order across chunk flushes', () {
+    final lines = [for (var i = 0; i < 20000; i++) '<p>$i</p>'];
+    final sink = HtmlFileSink(path);
+    lines.forEach(sink.writeln);
+    sink.close();
+
+    expect(File(path).readAsLinesSync(), lines);
+  });
+
+  test('keeps strings larger than a chunk in order', () {
+    final large = 'x' * 200000;
+    HtmlFileSink(path)
+      ..write('<img src="')
+      ..write(large)
+      ..writeln('">')
+      ..add(utf8.encode('<p>'))
+      ..close();
+
+    expect(File(path).readAsStringSync(), '<img src="$large">\n<p>');
+  });
+
+  test('encodes non-ASCII text as UTF-8', () {
+    HtmlFileSink(path)
+      ..write('naïve — 日本')
+      ..close();
+
+    expect(File(path).readAsBytesSync(), utf8.encode('naïve — 日本'));
+  });
+
+  test('replaces an existing file', () {
+    File(path).writeAsStringSync('x' * 1000);
+
+    HtmlFileSink(path)
+      ..write('<p>')
+      ..close();
+
+    expect(File(path).readAsStringSync(), '<p>');
+  });
+}
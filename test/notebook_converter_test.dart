@@ -0,0 +1,133 @@
+import 'dart:io';
+
+import 'package:flutter_test/flutter_test.dart';
+import 'package:path/path.dart' as p;
+
+import 'package:notebook_converter/models/notebook.dart';
+import 'package:notebook_converter/services/html_file_sink.dart';
+import 'package:notebook_converter/services/notebook_converter.dart';
+
+void main() {
+  final converter = NotebookConverter();
+  late Notebook notebook;
+  late String html;
+
+  setUpAll(() {
+    notebook = converter.parseNotebook(
+      File('test/fixtures/outputs.ipynb').readAsStringSync(),
+    );
+    html = converter.convertToHtml(notebook, title: 'Tom & "Jerry"');
+  });
+
+  group('escaping', () {
+    test('escapes the title', () {
+      expect(html, contains('<title>Tom &amp; &quot;Jerry&quot;</title>'));
+    });
+
+    test('escapes stream output, quotes included', () {
+      expect(html, contains('<pre>Tom &amp; &quot;Jerry&quot; &lt;it&#39;s&gt;\n</pre>'));
+    });
+
+    test('escapes plain-text results', () {
+      expect(html, contains('<pre>&#39;&lt;b&gt;&#39;</pre>'));
+    });
+
+    test('escapes errors and strips ANSI codes from tracebacks', () {
+      expect(html, contains('ZeroDivisionError: division by &quot;zero&quot;</div>'));
+      expect(html, contains('ZeroDivisionError: division by &#39;zero&#39;\n'));
+      expect(html, isNot(contains('\x1B')));
+    });
+
+    test('escapes raw cells', () {
+      expect(html, contains('<pre>&lt;raw &amp; &quot;unrendered&quot;&gt;</pre>'));
+    });
+
+    test('passes HTML output through unescaped', () {
+      expect(html, contains('<table><tr><td>1</td></tr></table>'));
+    });
+  });
+
+  group('cell rendering', () {
+    test('renders cells and their outputs in notebook order', () {
+      expectInOrder(html, [
+        '<div class="cell markdown-cell" data-cell-index="0">',
+        '<div class="cell code-cell" data-cell-index="1">',
+        '<div class="execution-count">In [2]:</div>',
+        '<pre><code class="language-python">',
+        '<div class="cell-output">',
+        '<div class="output-item output-stdout">',
+        '<div class="output-item output-stderr">',
+        '<div class="execution-count output-count">Out [2]:</div>',
+        '<div class="output-item output-text">',
+        '<div class="output-item output-image">',
+        '<div class="output-item output-image">',
+        '<div class="output-item output-html">',
+        '<div class="cell code-cell" data-cell-index="2">',
+        '<div class="output-item output-error">',
+        '<div class="cell raw-cell" data-cell-index="3">',
+      ]);
+    });
+
+    test('closes every element it opens', () {
+      expect('</div>'.allMatches(html).length, '<div'.allMatches(html).length);
+    });
+
+    test('renders markdown', () {
+      expect(html, contains('<em>results</em>'));
+      expect(html, contains('<code>a &lt; b</code>'));
+      expect(html, contains('Résumé'));
+    });
+
+    test('prefers images and HTML over plain text', () {
+      expect(html, contains('<img src="data:image/png;base64,'));
+      expect(html, contains('<circle r="1"/>'));
+      expect(html, isNot(contains('Figure size')));
+      expect(html, isNot(contains('<pre>table</pre>')));
+    });
+
+    test('joins multi-part images, trimming base64 lines only', () {
+      expect(
+        html,
+        contains('<img src="data:image/png;base64,iVBORw0KGgoAAAANSUhEUg==" alt="Output">'),
+      );
+      expect(
+        html,
+        contains('<svg xmlns="http://www.w3.org/2000/svg">\n<circle r="1"/>\n</svg>\n'),
+      );
+    });
+
+    test('leaves out code inputs when asked to', () {
+      final withoutInput = NotebookConverter(
+        settings: const ConversionSettings(includeInput: false),
+      ).convertToHtml(notebook);
+
+      expect(withoutInput, isNot(contains('In [')));
+      expect(withoutInput, isNot(contains('language-python')));
+      expect(withoutInput, contains('<div class="output-item output-stdout">'));
+    });
+  });
+
+  test('writes the same HTML to a file as to a string', () async {
+    final temp = await Directory.systemTemp.createTemp('notebook_converter_test');
+    addTearDown(() => temp.delete(recursive: true));
+    final path = p.join(temp.path, 'out.html');
+
+    // HtmlFileSink also takes bytes, so the stylesheet goes in pre-encoded
+    final sink = HtmlFileSink(path);
+    converter.writeHtml(notebook, sink, title: 'Tom & "Jerry"');
+    sink.close();
+
+    expect(File(path).readAsStringSync(), html);
+    expect(html, contains('/* ========== BASE STYLES ========== */'));
+  });
+}
+
+/// Expect each of [parts] in [html], in the given order
+void expectInOrder(String html, List<String> parts) {
+  var from = 0;
+  for (final part in parts) {
+    final index = html.indexOf(part, from);
+    expect(index, isNot(-1), reason: 'missing "$part" after offset $from');
+    from = index + part.length;
+  }
+}